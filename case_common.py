@@ -0,0 +1,310 @@
+"""Shared pieces of the two-part case generators.
+
+case_hcsr501.py and case_proto_board.py use the same open-top shell, the
+same top-frame tab cutouts and the same lid lip + tabs, only with different
+dimensions. The builders here are memoized on their parameters so repeated
+calls with the same dimensions reuse the solids instead of rebuilding them.
+
+The mesh backend (mesh_difference) and the BRep cache are also used by
+rag_basket.py.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+import ast
+import functools
+import hashlib
+import inspect
+import io
+import os
+import sys
+import tempfile
+import cadquery as cq
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+
+
+@dataclass(frozen=True)
+class CaseParams:
+    """Dimensions (mm) shared by the base and lid of a two-part case."""
+
+    inner_x: float
+    inner_y: float
+    inner_z: float
+    wall: float
+    lid_thick: float
+    tab_w: float
+    tab_h: float
+    lip_height: float
+    lip_clearance: float
+    rim_clearance: float
+
+    @classmethod
+    def from_constants(cls, namespace):
+        """Build from a script's upper-case constants (INNER_X, WALL, ...), e.g. its ``globals()``."""
+        return cls(**{f.name: namespace[f.name.upper()] for f in fields(cls)})
+
+    @property
+    def outer_x(self):
+        return self.inner_x + 2 * self.wall
+
+    @property
+    def outer_y(self):
+        return self.inner_y + 2 * self.wall
+
+    @property
+    def outer_z(self):
+        # bottom thickness included; the lid adds its own thickness
+        return self.inner_z + self.wall
+
+    # Tab centres sit 4 mm in from the inner corners; these are the spacings
+    # between the two tabs on a wall, as used by rarray.
+    @property
+    def tab_dx(self):
+        return self.inner_x - self.tab_w - 8.0
+
+    @property
+    def tab_dy(self):
+        return self.inner_y - self.tab_w - 8.0
+
+
+@functools.lru_cache(maxsize=32)
+def shelled_box(x, y, z, wall):
+    """Return an x * y * z box centred on the origin, shelled inward to ``wall`` with the top open.
+
+    Shelling is one of the slower OCCT operations, so the result is memoized.
+    """
+    return cq.Workplane("XY").box(x, y, z).faces("+Z").shell(-wall).val()
+
+
+@functools.lru_cache(maxsize=8)
+def tab_cutouts(params, fb_y_signs=(1, -1)):
+    """Return the top-frame cutouts that receive the lid tabs, as a tuple of solids.
+
+    ``fb_y_signs`` selects which long walls (-1: -Y, 1: +Y) get front/back
+    cutouts; both short walls always get left/right cutouts.
+    """
+    p = params
+    z = p.outer_z / 2 - p.wall / 2
+    cutouts = []
+    for y_sign in fb_y_signs:
+        cutouts += (
+            cq.Workplane("XY", origin=(0, y_sign * (p.outer_y / 2 - p.wall / 2), z))
+            .rarray(p.tab_dx, 1, 2, 1)
+            .box(p.tab_w + p.rim_clearance, p.wall + p.rim_clearance, p.wall, combine=False)
+            .vals()
+        )
+    cutouts += (
+        cq.Workplane("XY", origin=(0, 0, z))
+        .rarray(p.outer_x - p.wall, p.tab_dy, 2, 2)
+        .box(p.wall + p.rim_clearance, p.tab_w + p.rim_clearance, p.wall, combine=False)
+        .vals()
+    )
+    return tuple(cutouts)
+
+
+@functools.lru_cache(maxsize=8)
+def lid_lip_and_tabs(params):
+    """Return the inset lip and the downward tabs of the lid, as a tuple of solids.
+
+    The pieces are positioned for a lid plate centred on the origin and are
+    meant to be fused onto it in a single union.
+    """
+    p = params
+
+    # Inset lip that drops inside the case for a snug fit
+    lip = (
+        cq.Workplane("XY")
+        .workplane(offset=-p.lip_height)
+        .rect(p.inner_x - 2 * p.lip_clearance, p.inner_y - 2 * p.lip_clearance)
+        .extrude(p.lip_height)
+    )
+
+    # Tabs protruding down from the lid bottom, matching the base cutouts
+    tab_plane = cq.Workplane("XY", origin=(0, 0, -p.lid_thick / 2 - p.tab_h / 2))
+    tabs_fb = tab_plane.rarray(p.tab_dx, p.outer_y - p.wall, 2, 2).box(
+        p.tab_w, p.wall, p.tab_h, combine=False
+    )
+    tabs_lr = tab_plane.rarray(p.outer_x - p.wall, p.tab_dy, 2, 2).box(
+        p.wall, p.tab_w, p.tab_h, combine=False
+    )
+    return (*lip.vals(), *tabs_fb.vals(), *tabs_lr.vals())
+
+
+def top_edges(shape, top_z, tol=1e-6):
+    """Return the straight edges of ``shape`` lying in the plane z = ``top_z``.
+
+    A single pass over the edges, used in place of a string selector to pick
+    the outer top edges of a lid for chamfering.
+    """
+    return [
+        e
+        for e in shape.Edges()
+        if e.geomType() == "LINE"
+        and abs(e.startPoint().z - top_z) < tol
+        and abs(e.endPoint().z - top_z) < tol
+    ]
+
+
+def mesh_difference(shape, tools, tolerance, angular_tolerance):
+    """Subtract ``tools`` from ``shape`` on triangle meshes; return a trimesh.Trimesh.
+
+    Every solid is tessellated with the given absolute linear (mm) and
+    angular (rad) deflection, as export_stl_if_changed does, and the difference
+    runs in trimesh's manifold engine instead of an OCCT boolean. Only useful
+    when the result goes straight to STL. Requires trimesh and manifold3d.
+    """
+    import trimesh  # optional dependency, only needed for the mesh backend
+
+    def to_mesh(solid):
+        # Shape.tessellate meshes with a deflection relative to each edge's
+        # size and reuses any triangulation already on the shape (e.g. on a
+        # memoized shelled_box), so drop it and mesh with an absolute
+        # deflection first; tessellate then only reads the triangles.
+        BRepTools.Clean_s(solid.wrapped)
+        BRepMesh_IncrementalMesh(solid.wrapped, tolerance, False, angular_tolerance, True)
+        vertices, triangles = solid.tessellate(tolerance, angular_tolerance)
+        return trimesh.Trimesh([v.toTuple() for v in vertices], triangles)
+
+    return to_mesh(shape).difference([to_mesh(t) for t in tools], engine="manifold")
+
+
+def _stl_key_path(path):
+    """Return the file holding the shape hash of the STL ``path`` (see export_stl_if_changed)."""
+    return path.parent / f".cache_{path.name}.key"
+
+
+def export_mesh_difference(shape, tools, path, tolerance, angular_tolerance):
+    """Write ``shape`` minus ``tools``, computed by mesh_difference, to the STL file ``path``.
+
+    The key written by export_stl_if_changed no longer describes the file,
+    so it is removed: the next OCCT export then rewrites the STL.
+    """
+    mesh_difference(shape, tools, tolerance, angular_tolerance).export(str(path))
+    _stl_key_path(path).unlink(missing_ok=True)
+
+
+def _export_part(job):
+    """Build one part and write its STL. Top-level so a worker process can run it.
+
+    Returns the STL path and whether it was written (False if unchanged).
+    """
+    path, builder, mesh_inputs, tolerance, angular_tolerance = job
+    if mesh_inputs is not None:
+        shell, cutters = mesh_inputs()
+        export_mesh_difference(shell.val(), cutters, path, tolerance, angular_tolerance)
+        return path, True
+    return path, export_stl_if_changed(builder().val(), path, tolerance, angular_tolerance)
+
+
+def export_parts(builders, out_dir, prefix, tolerance, angular_tolerance, mesh_inputs=None):
+    """Build the parts of a case and write them to ``out_dir/<prefix>_<name>.stl``.
+
+    ``builders`` maps a part name to a module-level function returning its
+    cq.Workplane. ``mesh_inputs`` optionally maps a part name to a function
+    returning ``(shell, cutters)``; that part is then subtracted on meshes
+    with mesh_difference instead. Prints whether each STL was exported or
+    left unchanged and returns the ``(path, written)`` pairs.
+    """
+    mesh_inputs = mesh_inputs or {}
+    jobs = [
+        (out_dir / f"{prefix}_{name}.stl", builder, mesh_inputs.get(name), tolerance, angular_tolerance)
+        for name, builder in builders.items()
+    ]
+    # The parts are independent, CPU-bound builds: run them in parallel
+    with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+        results = list(ex.map(_export_part, jobs))
+    for path, written in results:
+        print(f"Exported {path}" if written else f"Unchanged {path}")
+    return results
+
+
+def export_stl_if_changed(shape, path, tolerance, angular_tolerance):
+    """Write ``shape`` to the STL file ``path`` unless it already holds this shape.
+
+    ``tolerance`` is the linear deflection in mm and ``angular_tolerance`` the
+    angular deflection in radians. The shape is identified by a hash of its
+    binary BRep plus the tessellation settings, stored next to the STL in a
+    ``.cache_<name>.key`` file. Returns True if the STL was (re)written.
+    """
+    # Absolute deflection: cadquery treats the tolerance as a fraction of each
+    # edge's size unless relative=False
+    settings = dict(tolerance=tolerance, angularTolerance=angular_tolerance, relative=False)
+    brep = io.BytesIO()
+    shape.exportBin(brep)
+    key = hashlib.blake2b(
+        brep.getvalue() + repr(sorted(settings.items())).encode(), digest_size=16
+    ).hexdigest()
+    key_path = _stl_key_path(path)
+    if path.exists() and key_path.exists() and key_path.read_text() == key:
+        return False
+
+    # Mesh once (in parallel) and write the STL straight from the shape
+    shape.exportStl(str(path), ascii=False, parallel=True, **settings)
+    key_path.write_text(key)
+    return True
+
+
+def load_or_build_brep(path, build, stale_glob=None):
+    """Return the shape stored in the binary BRep file ``path``, building it on a miss.
+
+    ``build`` returns a cq.Shape. A new file is written to a temporary name
+    in the same directory and moved into place, so a killed run never leaves
+    a partial cache behind; an unreadable file counts as a miss. After a
+    rebuild, other files in the directory matching ``stale_glob`` (caches
+    from older keys) are removed. The shape is always read back from disk so
+    cold and warm runs yield identical shapes.
+    """
+    if path.exists():
+        try:
+            return cq.Shape.importBin(str(path))
+        except Exception:  # truncated or corrupt cache file: rebuild it
+            pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        build().exportBin(tmp)
+        # mkstemp creates the file 0600; give it the usual umask-based mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    if stale_glob:
+        for old in path.parent.glob(stale_glob):
+            if old != path:
+                old.unlink(missing_ok=True)
+    return cq.Shape.importBin(str(path))
+
+
+def source_key(*modules):
+    """Return a hash of the code of ``modules``, ignoring comments and formatting."""
+    trees = [ast.dump(ast.parse(inspect.getsource(m))) for m in modules]
+    return hashlib.blake2b("\n".join(trees).encode(), digest_size=16).hexdigest()
+
+
+def brep_cached(out_dir):
+    """Decorate a no-argument case builder to reuse its shape from a binary BRep in ``out_dir``.
+
+    The cache key covers the code of the builder's module and of this module,
+    dimension constants included, so changing either triggers a rebuild;
+    comment-only edits do not. Files from older keys are pruned on rebuild.
+    """
+
+    def decorate(builder):
+        @functools.wraps(builder)
+        def wrapper():
+            module = sys.modules[builder.__module__]
+            stem = f".cache_{Path(module.__file__).stem}_{builder.__name__}"
+            path = out_dir / f"{stem}_{source_key(module, sys.modules[__name__])}.brep"
+            shape = load_or_build_brep(path, lambda: builder().val(), stale_glob=f"{stem}_*.brep")
+            return cq.Workplane("XY").newObject([shape])
+
+        return wrapper
+
+    return decorate
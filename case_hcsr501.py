@@ -6,6 +6,7 @@ and a matching lid with an inset lip. Outputs STL files into stl-draft/ by defau
 from pathlib import Path
 import math
 import cadquery as cq
+import case_common
 
 # Default dimensions (mm)
 INNER_X = 33.0  # payload length
@@ -29,17 +30,32 @@ LIP_CLEARANCE = 0.25  # clearance on each side for press fit
 RIM_CLEARANCE = 0.3   # clearance for rim cutouts
 RIM_HEIGHT = TAB_H    # outer rim drop down to match tabs
 
+# STL export: 0.2 mm linear (absolute) deflection is plenty for print preview
+STL_TOLERANCE = 0.2
+STL_ANGULAR_TOLERANCE = 0.3
+
+# Subtract the base cutters on triangle meshes (trimesh + manifold3d) instead
+# of in OCCT when exporting; the STL is the only output, so no B-Rep is needed
+USE_TRIMESH_BACKEND = False
+
 OUT_DIR = Path(__file__).parent / "stl-draft"
 OUT_DIR.mkdir(exist_ok=True)
 
 
-def build_base():
-    outer_x = INNER_X + 2 * WALL
-    outer_y = INNER_Y + 2 * WALL
-    outer_z = INNER_Z + WALL  # bottom thickness included; lid adds its own thickness
+def case_params():
+    """Return the shared case dimensions as a hashable CaseParams."""
+    return case_common.CaseParams.from_constants(globals())
+
 
-    base = cq.Workplane("XY").box(outer_x, outer_y, outer_z)
-    base = base.faces("+Z").shell(-WALL)  # open top shell; negative for inward shell
+def _base_shell_and_cutters():
+    """Return the open-top base shell and the solids to subtract from it."""
+    params = case_params()
+    outer_x = params.outer_x
+    outer_y = params.outer_y
+    outer_z = params.outer_z  # bottom thickness included; lid adds its own thickness
+
+    # open top shell, hollowed inward by the wall thickness
+    base = cq.Workplane("XY").newObject([case_common.shelled_box(outer_x, outer_y, outer_z, WALL)])
 
     # Add a small outer chamfer on the top edge for easier lid seating (if edges exist)
     # try:
@@ -63,14 +79,15 @@ def build_base():
         (0.0, z_apex),
         (-half_w, z_rect_top),
     ]
-    # Build cutter on XZ plane offset to +Y face; limit extrusion to wall thickness
-    pin_cutter = (
-        cq.Workplane("XZ").workplane(offset=outer_y / 2)
-        .polyline(polygon)
-        .close()
-        .extrude(WALL + EXTRUDE_MARGIN, both=True)
+    # Build cutter in the wall plane, extruded symmetrically so it is limited
+    # to the wall thickness. The XZ workplane normal is -Y, so the plane at
+    # offset outer_y / 2 is y = -outer_y / 2. The wire is made in one call.
+    pin_y = -outer_y / 2
+    pin_depth = WALL + EXTRUDE_MARGIN
+    pin_wire = cq.Wire.makePolygon(
+        [cq.Vector(x, pin_y - pin_depth, z) for x, z in polygon], close=True
     )
-    base = base.cut(pin_cutter)
+    pin_cutter = cq.Solid.extrudeLinear(pin_wire, [], cq.Vector(0, 2 * pin_depth, 0))
 
     # Front-face Fresnel opening: spans entire width and height for unobstructed sensor insertion
     fresnel_w = outer_y
@@ -80,19 +97,6 @@ def build_base():
         .translate((0, 0, WALL))
         .extrude(27, both=True)
     )
-    base = base.cut(fresnel_cutter)
-
-    # Cut cutouts in the top frame for lid tabs
-    # Front/back cutouts
-    x_positions = [-(INNER_X / 2 - TAB_W / 2 - 4.0), (INNER_X / 2 - TAB_W / 2 - 4.0)]
-    for y_sign in (-1,):  # Cut tabs for the solid long wall (that the pins plug into)
-        for x in x_positions:
-            cutout_fb = (
-                cq.Workplane("XY")
-                .box(TAB_W + RIM_CLEARANCE, WALL + RIM_CLEARANCE, WALL)
-                .translate((x, y_sign * (outer_y / 2 - WALL / 2), outer_z / 2 - WALL / 2))
-            )
-            base = base.cut(cutout_fb)
 
     # Cut out the other long wall entirely as a single full-height notch
     # Span full Z (outer_z) and extend into the side walls so no floating pieces remain
@@ -101,90 +105,76 @@ def build_base():
         .box(outer_x + 2 * WALL, WALL + RIM_CLEARANCE, WALL)
         .translate((0, outer_y / 2 - (WALL + RIM_CLEARANCE) / 2, outer_z / 2 - WALL / 2))
     )
-    base = base.cut(cutout_long_wall)
 
-    # Left/right cutouts
-    y_positions = [-(INNER_Y / 2 - TAB_W / 2 - 4.0), (INNER_Y / 2 - TAB_W / 2 - 4.0)]
-    for x_sign in (1, -1):
-        for y in y_positions:
-            cutout_lr = (
-                cq.Workplane("XY")
-                .box(WALL + RIM_CLEARANCE, TAB_W + RIM_CLEARANCE, WALL)
-                .translate((x_sign * (outer_x / 2 - WALL / 2), y, outer_z / 2 - WALL / 2))
-            )
-            base = base.cut(cutout_lr)
+    # Collect every cutter and subtract them from the shell in a single
+    # boolean; one cut per tab re-traverses the whole solid each time.
+    # Tab cutouts go only on the solid long wall (that the pins plug into)
+    # and on both short walls.
+    cutters = [
+        pin_cutter,
+        fresnel_cutter.val(),
+        cutout_long_wall.val(),
+        *case_common.tab_cutouts(params, fb_y_signs=(-1,)),
+    ]
 
-    return base
+    return base, cutters
 
 
-def build_lid():
-    outer_x = INNER_X + 2 * WALL
-    outer_y = INNER_Y + 2 * WALL
+@case_common.brep_cached(OUT_DIR)
+def build_base():
+    base, cutters = _base_shell_and_cutters()
+    # Pass the cutters as separate tools rather than one compound: some of
+    # them overlap, which OCCT does not accept inside a single compound.
+    return base.cut(cq.Workplane("XY").newObject(cutters))
 
-    lid = cq.Workplane("XY").box(outer_x, outer_y, LID_THICK)
 
-    # Add an inset lip that drops inside the case for a snug fit
-    lip_inner_x = INNER_X - 2 * LIP_CLEARANCE
-    lip_inner_y = INNER_Y - 2 * LIP_CLEARANCE
-    lip = (
-        cq.Workplane("XY")
-        .workplane(offset=-LIP_HEIGHT)
-        .rect(lip_inner_x, lip_inner_y)
-        .extrude(LIP_HEIGHT)
-    )
-    lid = lid.union(lip)
+@case_common.brep_cached(OUT_DIR)
+def build_lid():
+    params = case_params()
+    outer_x = params.outer_x
+    outer_y = params.outer_y
+
+    # Lid plate plus the extension on the Fresnel edge (dropping down by the
+    # wall height, outer face coplanar with the lid edge), drawn as a single
+    # L-shaped profile in YZ and extruded along X: one prism, no fuse needed.
+    y_edge = -outer_y / 2
+    z_top = LID_THICK / 2
+    z_bottom = -LID_THICK / 2
+    lid_profile = [
+        (y_edge, z_bottom - WALL),
+        (y_edge + WALL, z_bottom - WALL),
+        (y_edge + WALL, z_bottom),
+        (outer_y / 2, z_bottom),
+        (outer_y / 2, z_top),
+        (y_edge, z_top),
+    ]
+    lid = cq.Workplane("YZ").polyline(lid_profile).close().extrude(outer_x / 2, both=True)
 
-    # Add extension on the Fresnel-edge of the lid, extruding in Z by wall height
-    fresnel_edge_extension = (
-        cq.Workplane("XY")
-        .box(outer_x, WALL, WALL)
-        # Move the center inside by WALL/2 so the outer face is coplanar
-        # with the lid outer face (center at -outer_y/2 + WALL/2).
-        .translate((0, -outer_y / 2 + WALL / 2, -LID_THICK / 2 - WALL / 2))
-    )
-    lid = lid.union(fresnel_edge_extension)
-
-    # Add tabs protruding down from the lid bottom
-    # Front/back tabs
-    x_positions = [-(INNER_X / 2 - TAB_W / 2 - 4.0), (INNER_X / 2 - TAB_W / 2 - 4.0)]
-    for y_sign in (1, -1):  # Both sides
-        for x in x_positions:
-            tab_fb = (
-                cq.Workplane("XY")
-                .box(TAB_W, WALL, TAB_H)
-                .translate((x, y_sign * (outer_y / 2 - WALL / 2), -LID_THICK / 2 - TAB_H / 2))
-            )
-            lid = lid.union(tab_fb)
-
-    # Left/right tabs
-    y_positions = [-(INNER_Y / 2 - TAB_W / 2 - 4.0), (INNER_Y / 2 - TAB_W / 2 - 4.0)]
-    for x_sign in (1, -1):
-        for y in y_positions:
-            tab_lr = (
-                cq.Workplane("XY")
-                .box(WALL, TAB_W, TAB_H)
-                .translate((x_sign * (outer_x / 2 - WALL / 2), y, -LID_THICK / 2 - TAB_H / 2))
-            )
-            lid = lid.union(tab_lr)
+    # Add the inset lip and the tabs protruding down from the lid bottom.
+    # They are fused onto the lid in a single boolean.
+    parts = case_common.lid_lip_and_tabs(params)
+
+    # The tabs on the Fresnel edge sit inside the extension, so the pieces
+    # overlap and a plain fuse is required (glue mode needs disjoint solids).
+    lid = lid.union(cq.Workplane("XY").newObject(list(parts)))
 
     # Chamfer outer top edges for feel
     try:
-        lid = lid.edges("|Z and >Z").chamfer(0.6)
+        lid = lid.newObject(case_common.top_edges(lid.val(), LID_THICK / 2)).chamfer(0.6)
     except ValueError:
         pass
     return lid
 
 
 def export():
-    base = build_base()
-    lid = build_lid()
-
-    base_path = OUT_DIR / "hcsr501_case_base.stl"
-    lid_path = OUT_DIR / "hcsr501_case_lid.stl"
-    cq.exporters.export(base, str(base_path))
-    cq.exporters.export(lid, str(lid_path))
-    print(f"Exported {base_path}")
-    print(f"Exported {lid_path}")
+    case_common.export_parts(
+        {"base": build_base, "lid": build_lid},
+        OUT_DIR,
+        "hcsr501_case",
+        STL_TOLERANCE,
+        STL_ANGULAR_TOLERANCE,
+        mesh_inputs={"base": _base_shell_and_cutters} if USE_TRIMESH_BACKEND else None,
+    )
 
 
 if __name__ == "__main__":
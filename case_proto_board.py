@@ -5,6 +5,7 @@ for a wiring connector. Adjustable parameters at top.
 """
 from pathlib import Path
 import cadquery as cq
+import case_common
 
 # Board inner dimensions (mm)
 INNER_X = 25.0  # board length (X)
@@ -26,17 +27,32 @@ RIM_CLEARANCE = 0.3
 LIP_HEIGHT = 1.2
 LIP_CLEARANCE = 0.25
 
+# STL export: 0.2 mm linear (absolute) deflection is plenty for print preview
+STL_TOLERANCE = 0.2
+STL_ANGULAR_TOLERANCE = 0.3
+
+# Subtract the base cutters on triangle meshes (trimesh + manifold3d) instead
+# of in OCCT when exporting; the STL is the only output, so no B-Rep is needed
+USE_TRIMESH_BACKEND = False
+
 OUT_DIR = Path(__file__).parent / "stl-draft"
 OUT_DIR.mkdir(exist_ok=True)
 
 
-def build_base():
-    outer_x = INNER_X + 2 * WALL
-    outer_y = INNER_Y + 2 * WALL
-    outer_z = INNER_Z + WALL
+def case_params():
+    """Return the shared case dimensions as a hashable CaseParams."""
+    return case_common.CaseParams.from_constants(globals())
+
 
-    base = cq.Workplane("XY").box(outer_x, outer_y, outer_z)
-    base = base.faces("+Z").shell(-WALL)
+def _base_shell_and_cutters():
+    """Return the open-top base shell and the solids to subtract from it."""
+    params = case_params()
+    outer_x = params.outer_x
+    outer_y = params.outer_y
+    outer_z = params.outer_z
+
+    # open top shell, hollowed inward by the wall thickness
+    base = cq.Workplane("XY").newObject([case_common.shelled_box(outer_x, outer_y, outer_z, WALL)])
 
     # Connector slot on short (-Y) face: build cutter on XZ workplane
     # Create a rectangular top portion and a semicircular bottom, then
@@ -57,98 +73,67 @@ def build_base():
     inner_top_z = outer_z / 2.0 + eps
     poly = [(-R, inner_top_z), (R, inner_top_z), (R, 0.0), (-R, 0.0)]
 
-    rect_sketch = cq.Workplane("XZ").workplane(offset=-outer_y / 2).polyline(poly).close()
-    rect_cut = rect_sketch.extrude(WALL + SLOT_MARGIN, both=True)
+    # The XZ workplane at offset -outer_y / 2 (normal -Y) is the plane
+    # y = outer_y / 2; make the wire in one call and extrude it symmetrically
+    # through that plane.
+    slot_y = outer_y / 2
+    slot_depth = WALL + SLOT_MARGIN
+    rect_wire = cq.Wire.makePolygon(
+        [cq.Vector(x, slot_y - slot_depth, z) for x, z in poly], close=True
+    )
+    rect_cut = cq.Solid.extrudeLinear(rect_wire, [], cq.Vector(0, 2 * slot_depth, 0))
 
     # Circle centered at Z=0 provides the rounded bottom (radius = R)
     circ_sketch = cq.Workplane("XZ").workplane(offset=-outer_y / 2).circle(R)
     circ_cut = circ_sketch.extrude(WALL + SLOT_MARGIN, both=True).translate((0, 0, 0.0))
 
-    # Union rectangle + circle so the sides are vertical (tangent at Z=0)
-    slot_cutter = rect_cut.union(circ_cut)
-    base = base.cut(slot_cutter)
-
-    # Cut cutouts in the top frame for lid tabs (peg holes)
-    x_positions = [-(INNER_X / 2 - TAB_W / 2 - 4.0), (INNER_X / 2 - TAB_W / 2 - 4.0)]
-    for y_sign in (1, -1):
-        for x in x_positions:
-            cutout_fb = (
-                cq.Workplane("XY")
-                .box(TAB_W + RIM_CLEARANCE, WALL + RIM_CLEARANCE, WALL)
-                .translate((x, y_sign * (outer_y / 2 - WALL / 2), outer_z / 2 - WALL / 2))
-            )
-            base = base.cut(cutout_fb)
-
-    y_positions = [-(INNER_Y / 2 - TAB_W / 2 - 4.0), (INNER_Y / 2 - TAB_W / 2 - 4.0)]
-    for x_sign in (1, -1):
-        for y in y_positions:
-            cutout_lr = (
-                cq.Workplane("XY")
-                .box(WALL + RIM_CLEARANCE, TAB_W + RIM_CLEARANCE, WALL)
-                .translate((x_sign * (outer_x / 2 - WALL / 2), y, outer_z / 2 - WALL / 2))
-            )
-            base = base.cut(cutout_lr)
-
-    return base
+    # Subtract rectangle + circle together so the sides are vertical (tangent
+    # at Z=0); no need to fuse them into one cutter first. The peg holes
+    # (cutouts in the top frame for lid tabs) go into the same boolean.
+    cutters = [rect_cut, circ_cut.val(), *case_common.tab_cutouts(params)]
+
+    return base, cutters
 
 
+@case_common.brep_cached(OUT_DIR)
+def build_base():
+    base, cutters = _base_shell_and_cutters()
+    # Pass the cutters as separate tools rather than one compound: some of
+    # them overlap, which OCCT does not accept inside a single compound.
+    return base.cut(cq.Workplane("XY").newObject(cutters))
+
+
+@case_common.brep_cached(OUT_DIR)
 def build_lid():
-    outer_x = INNER_X + 2 * WALL
-    outer_y = INNER_Y + 2 * WALL
-
-    lid = cq.Workplane("XY").box(outer_x, outer_y, LID_THICK)
-
-    # Add an inset lip that drops inside the case for a snug fit
-    lip_inner_x = INNER_X - 2 * LIP_CLEARANCE
-    lip_inner_y = INNER_Y - 2 * LIP_CLEARANCE
-    lip = (
-        cq.Workplane("XY")
-        .workplane(offset=-LIP_HEIGHT)
-        .rect(lip_inner_x, lip_inner_y)
-        .extrude(LIP_HEIGHT)
-    )
-    lid = lid.union(lip)
-
-    # Add tabs protruding down from the lid bottom so they line up with
-    # the peg holes cut in the base above.
-    x_positions = [-(INNER_X / 2 - TAB_W / 2 - 4.0), (INNER_X / 2 - TAB_W / 2 - 4.0)]
-    for y_sign in (1, -1):
-        for x in x_positions:
-            tab_fb = (
-                cq.Workplane("XY")
-                .box(TAB_W, WALL, TAB_H)
-                .translate((x, y_sign * (outer_y / 2 - WALL / 2), -LID_THICK / 2 - TAB_H / 2))
-            )
-            lid = lid.union(tab_fb)
-
-    y_positions = [-(INNER_Y / 2 - TAB_W / 2 - 4.0), (INNER_Y / 2 - TAB_W / 2 - 4.0)]
-    for x_sign in (1, -1):
-        for y in y_positions:
-            tab_lr = (
-                cq.Workplane("XY")
-                .box(WALL, TAB_W, TAB_H)
-                .translate((x_sign * (outer_x / 2 - WALL / 2), y, -LID_THICK / 2 - TAB_H / 2))
-            )
-            lid = lid.union(tab_lr)
+    params = case_params()
+    lid = cq.Workplane("XY").box(params.outer_x, params.outer_y, LID_THICK)
+
+    # Add the inset lip and the tabs protruding down from the lid bottom so
+    # they line up with the peg holes cut in the base above. They are fused
+    # onto the lid in a single boolean.
+    parts = case_common.lid_lip_and_tabs(params)
+
+    # The lip is partly embedded in the lid plate, so glue mode (which
+    # expects solids that only share faces) is not safe here.
+    lid = lid.union(cq.Workplane("XY").newObject(list(parts)))
 
     # Chamfer outer top edges for feel (same as HC-SR501 lid)
     try:
-        lid = lid.edges("|Z and >Z").chamfer(0.6)
+        lid = lid.newObject(case_common.top_edges(lid.val(), LID_THICK / 2)).chamfer(0.6)
     except ValueError:
         pass
     return lid
 
 
 def export():
-    base = build_base()
-    lid = build_lid()
-
-    base_path = OUT_DIR / "proto_board_base.stl"
-    lid_path = OUT_DIR / "proto_board_lid.stl"
-    cq.exporters.export(base, str(base_path))
-    cq.exporters.export(lid, str(lid_path))
-    print(f"Exported {base_path}")
-    print(f"Exported {lid_path}")
+    case_common.export_parts(
+        {"base": build_base, "lid": build_lid},
+        OUT_DIR,
+        "proto_board",
+        STL_TOLERANCE,
+        STL_ANGULAR_TOLERANCE,
+        mesh_inputs={"base": _base_shell_and_cutters} if USE_TRIMESH_BACKEND else None,
+    )
 
 
 if __name__ == "__main__":
@@ -1,14 +1,23 @@
 import os
 import argparse
+import functools
+import hashlib
 import cadquery as cq
+import numpy as np
+from OCP.BRep import BRep_Builder
+from OCP.gp import gp_Trsf, gp_Vec
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS_Compound
 from pathlib import Path
 
 """rag-basket.py
 
 Modular rag basket generator compatible with the CadQuery MCP server.
 - Exposes `make_rag_basket(...) -> cadquery.Workplane` for programmatic use
-- Creates a module-level `result` variable and ends with `show_object(result)` per MCP requirements
+- Exposes a module-level `result`, built lazily on first access, and ends with `show_object(result)` per MCP requirements
 - Provides a CLI to export to draft/final folders
+- Runs standalone; only `--backend manifold` and the disk cache of `result`
+  use case_common.py from the same folder
 """
 
 # --- Default Parameters (mm) ---
@@ -26,8 +35,78 @@ DIAMOND_HEIGHT = 12.0
 DIAMOND_SPACING_X = 4.0
 DIAMOND_SPACING_Y = 4.0
 
+# STL export: linear deflection (absolute, mm) and angular deflection (rad)
+# suited to a printed basket
+STL_TOLERANCE = 0.1
+STL_ANGULAR_TOLERANCE = 0.5
 
-def make_rag_basket(
+
+def _staggered_grid(nx, ny, pitch_x, pitch_y, x0, z0):
+    """Return the (nx * ny, 2) array of diamond centres, row by row.
+
+    Odd rows are shifted by half a pitch so the diamonds interlock.
+    """
+    i = np.arange(nx).reshape(1, nx)
+    j = np.arange(ny).reshape(ny, 1)
+    lx = x0 + i * pitch_x + (j % 2) * (pitch_x / 2.0)
+    lz = z0 + j * pitch_y + np.zeros((1, nx))
+    out = np.empty((nx * ny, 2))
+    out[:, 0] = lx.ravel()
+    out[:, 1] = lz.ravel()
+    return out
+
+
+# Lattice walls: face selector -> (wall plane, global axis of lx, axis normal
+# to the wall, side of the wall along that axis). The Y walls lie in XZ and
+# span the width; the X walls lie in YZ and span the depth.
+_FACE_TABLE = {
+    "-Y": ("XZ", 0, 1, -1),
+    "+Y": ("XZ", 0, 1, 1),
+    "+X": ("YZ", 1, 0, 1),
+    "-X": ("YZ", 1, 0, -1),
+}
+
+
+def _wall_centers(points, lx_axis, wall_axis, wall_pos, cull, horiz_center, horiz_clear, skip_min_z, skip_max_z):
+    """Map face-local centres (lx, lz) onto a wall; return the (N, 3) global centres kept.
+
+    lx goes to global axis `lx_axis`, lz to Z, and axis `wall_axis` is fixed
+    at `wall_pos`. With `cull` set, centres within `horiz_clear` of
+    `horiz_center` horizontally and between `skip_min_z` and `skip_max_z`
+    are dropped.
+    """
+    lx = points[:, 0]
+    lz = points[:, 1]
+    keep = np.ones(lx.shape[0], dtype=bool)
+    if cull:
+        keep = ~((np.abs(lx - horiz_center) < horiz_clear) & (lz > skip_min_z) & (lz < skip_max_z))
+    idx = np.nonzero(keep)[0]
+    out = np.empty((idx.shape[0], 3))
+    out[:, lx_axis] = lx[idx]
+    out[:, wall_axis] = wall_pos
+    out[:, 2] = lz[idx]
+    return out
+
+
+def _grid_params(face_w, face_h, lattice_offset_edge, diamond_width, diamond_height, spacing_x, spacing_y):
+    """Return the `_staggered_grid` arguments (nx, ny, pitch_x, pitch_y, x0, z0) for a wall, or None.
+
+    Diamonds may reach the side edges of the wall but keep `lattice_offset_edge`
+    clearance from the top and bottom; the grid is centred on the wall.
+    """
+    pitch_x = diamond_width + spacing_x
+    pitch_y = diamond_height + spacing_y
+    nx = int(max(0, face_w) / pitch_x)
+    ny = int(max(0, face_h - 2 * lattice_offset_edge) / pitch_y)
+    if nx <= 0 or ny <= 0:
+        return None
+
+    grid_total_w = nx * diamond_width + (nx - 1) * spacing_x
+    grid_total_h = ny * diamond_height + (ny - 1) * spacing_y
+    return nx, ny, pitch_x, pitch_y, -grid_total_w / 2 + diamond_width / 2, -grid_total_h / 2 + diamond_height / 2
+
+
+def _basket_shell_and_cutters(
     width: float = DEFAULT_WIDTH,
     depth: float = DEFAULT_DEPTH,
     height: float = DEFAULT_HEIGHT,
@@ -39,12 +118,11 @@ def make_rag_basket(
     diamond_height: float = DIAMOND_HEIGHT,
     diamond_spacing_x: float = DIAMOND_SPACING_X,
     diamond_spacing_y: float = DIAMOND_SPACING_Y,
-) -> cq.Workplane:
-    """Build the rag basket cadquery object and return it.
+):
+    """Return the open-top shell, the slot cutter and the diamond placements.
 
-    The bottom remains solid, the top is open, the front (+Y) has a slot
-    that goes halfway down by default, and the back/left/right faces have
-    a diamond lattice.
+    The placements are one `(prototype, centres)` pair per wall, where
+    `centres` is an (N, 3) array of global positions for the prototype.
     """
 
     # Create base box and shell (leave top open)
@@ -90,193 +168,279 @@ def make_rag_basket(
         slot_horiz_half = slot_width / 2
         slot_min_z = cut_center_z - total_cut_h / 2
         slot_max_z = cut_center_z + total_cut_h / 2
-    model = model.cut(cutter)
+    # Diamonds on the wall opposite the slot are skipped where they would
+    # overlap the slot region, with `lattice_offset_edge` as horizontal and
+    # vertical clearance (user requested). These bounds are the same for
+    # every diamond, so compute them once here.
+    opposite_face = {"+X": "-X", "-X": "+X", "+Y": "-Y", "-Y": "+Y"}[slot_face]
+    horiz_clear = slot_horiz_half + lattice_offset_edge
+    skip_min_z = slot_min_z - lattice_offset_edge
+    skip_max_z = slot_max_z + lattice_offset_edge
+
+    # Diamond cutter prototypes, built once per wall orientation and placed on
+    # every lattice point with `moved`, which only attaches a location to the
+    # shared geometry. Use a short symmetric extrusion so the cutter only
+    # penetrates the wall thickness (with a small margin).
+    extrude_len = wall_thickness + 2.0
+    # The diamond outline is one closed polygon wire, drawn once as a sketch
+    # and placed on both wall planes.
+    diamond = cq.Sketch().polygon([
+        (0, diamond_height / 2),
+        (diamond_width / 2, 0),
+        (0, -diamond_height / 2),
+        (-diamond_width / 2, 0),
+        (0, diamond_height / 2),
+    ])
+    proto_xz = cq.Workplane("XZ").placeSketch(diamond).extrude(extrude_len, both=True).val()
+    proto_yz = cq.Workplane("YZ").placeSketch(diamond).extrude(extrude_len, both=True).val()
+
+    # Face-local diamond centres (lx, lz), shared by the two walls of each
+    # orientation: the Y walls span the width, the X walls span the depth.
+    def face_points(face_w):
+        params = _grid_params(
+            face_w,
+            height - wall_thickness,
+            lattice_offset_edge,
+            diamond_width,
+            diamond_height,
+            diamond_spacing_x,
+            diamond_spacing_y,
+        )
+        if params is None:
+            return None
+        # Stagger rows so diamonds interlock: odd rows shift by half a pitch.
+        return _staggered_grid(*params)
 
-    # Diamond profile defined inline per-face (no shared intermediate variable)
+    walls = {
+        "XZ": (face_points(width - 2 * wall_thickness), proto_xz),
+        "YZ": (face_points(depth - 2 * wall_thickness), proto_yz),
+    }
 
     def create_lattice_for_face(cad_obj: cq.Workplane, face_selector: str):
-        """Create and apply diamond cutters positioned in world coordinates for the given face.
+        """Position the diamond cutters in world coordinates for the given face.
 
         This avoids selecting faces and using `.workplane()` which can fail when multiple
         coplanar or inner/outer faces are present.
         """
-        # Build a list of cutters (TopoDS shapes) and return them. This keeps
-        # the lattice generation consistent with diagnostic logic and avoids
-        # applying cuts inside this helper (caller will apply them).
-        if face_selector in ("-Y", "+Y"):
-            face_w = width - 2 * wall_thickness
-            face_h = height - wall_thickness
-            plane = "XZ"
-            depth_extra = depth + 10
-        else:
-            face_w = depth - 2 * wall_thickness
-            face_h = height - wall_thickness
-            plane = "YZ" if face_selector in ("+X", "-X") else "XZ"
-            depth_extra = width + 10
-
-        # Allow diamonds to reach side edges; keep vertical clearance from top/bottom
-        usable_w = face_w
-        usable_h = face_h - 2 * lattice_offset_edge
-        nx = int(max(0, usable_w) / (diamond_width + diamond_spacing_x))
-        ny = int(max(0, usable_h) / (diamond_height + diamond_spacing_y))
-
-        cutters = []
-        if nx <= 0 or ny <= 0:
-            return cutters
-
-        grid_total_w = nx * diamond_width + (nx - 1) * diamond_spacing_x
-        grid_total_h = ny * diamond_height + (ny - 1) * diamond_spacing_y
-
-        # Stagger rows so diamonds interlock
-        for j in range(ny):
-            row_offset = (diamond_width + diamond_spacing_x) / 2.0 if (j % 2) == 1 else 0.0
-            for i in range(nx):
-                lx = (
-                    -grid_total_w / 2
-                    + diamond_width / 2
-                    + i * (diamond_width + diamond_spacing_x)
-                    + row_offset
-                )
-                lz = -grid_total_h / 2 + diamond_height / 2 + j * (diamond_height + diamond_spacing_y)
-
-                # Determine which face contains the slot (mirror of slot placement above)
-                slot_face = "+X" if depth > width else "+Y"
-                # We want to skip diamonds on the face opposite the slot face
-                opposite_face = {"+X": "-X", "-X": "+X", "+Y": "-Y", "-Y": "+Y"}[slot_face]
-                # Compute vertical bounds of the slot area so we can keep clearance
-                slot_cut_height = height * slot_depth_ratio
-                margin = 5.0
-                total_cut_h = slot_cut_height + margin
-                cut_center_z = height / 2 - slot_cut_height / 2 + margin / 2
-                slot_min_z = cut_center_z - total_cut_h / 2
-                slot_max_z = cut_center_z + total_cut_h / 2
-
-                # Skip diamonds overlapping the slot region on the face opposite
-                # the slot face (user requested). Use `lattice_offset_edge` as horizontal/vertical clearance.
-                horiz_clear = slot_width / 2 + lattice_offset_edge
-                # Compute global center coordinates for this diamond on the model
-                if face_selector == "-Y":
-                    center = (lx, -depth / 2, lz)
-                elif face_selector == "+Y":
-                    center = (lx, depth / 2, lz)
-                elif face_selector == "+X":
-                    center = (width / 2, lx, lz)
-                elif face_selector == "-X":
-                    center = (-width / 2, lx, lz)
-                else:
-                    center = (lx, 0, lz)
-
-                cx, cy, cz = center
-                # If this face is the opposite face to the slot, test the appropriate
-                # horizontal coordinate (Y for X-facing slot, X for Y-facing slot)
-                # and the vertical (Z) span before skipping.
-                # Use a short symmetric extrusion length for diamonds
-                extrude_len = wall_thickness + 2.0
-
-                # Use coordinate tests against the computed slot bounding area
-                # to decide skipping. This avoids false positives from full
-                # through-thickness geometric cutters intersecting opposite faces.
-                if face_selector == opposite_face:
-                    if slot_face.endswith("X"):
-                        within_horiz = abs(cy - slot_horiz_center) < (slot_horiz_half + lattice_offset_edge)
-                    else:
-                        within_horiz = abs(cx - slot_horiz_center) < (slot_horiz_half + lattice_offset_edge)
-                    within_vert = (cz > (slot_min_z - lattice_offset_edge)) and (cz < (slot_max_z + lattice_offset_edge))
-                    if within_horiz and within_vert:
-                        continue
-
-                # Use a short symmetric extrusion so cutter only penetrates the
-                # wall thickness (with a small margin) and align it on the face
-                # plane before moving into place.
-                extrude_len = wall_thickness + 2.0
-                if face_selector == "-Y":
-                    cutter = (
-                        cq.Workplane("XZ")
-                        .polyline([
-                            (0, diamond_height / 2),
-                            (diamond_width / 2, 0),
-                            (0, -diamond_height / 2),
-                            (-diamond_width / 2, 0),
-                        ])
-                        .close()
-                        .extrude(extrude_len, both=True)
-                        .val()
-                        .moved(cq.Location(cq.Vector(cx, cy, cz)))
-                    )
-                elif face_selector == "+X":
-                    cutter = (
-                        cq.Workplane("YZ")
-                        .polyline([
-                            (0, diamond_height / 2),
-                            (diamond_width / 2, 0),
-                            (0, -diamond_height / 2),
-                            (-diamond_width / 2, 0),
-                        ])
-                        .close()
-                        .extrude(extrude_len, both=True)
-                        .val()
-                        .moved(cq.Location(cq.Vector(cx, cy, cz)))
-                    )
-                elif face_selector == "-X":
-                    cutter = (
-                        cq.Workplane("YZ")
-                        .polyline([
-                            (0, diamond_height / 2),
-                            (diamond_width / 2, 0),
-                            (0, -diamond_height / 2),
-                            (-diamond_width / 2, 0),
-                        ])
-                        .close()
-                        .extrude(extrude_len, both=True)
-                        .val()
-                        .moved(cq.Location(cq.Vector(cx, cy, cz)))
-                    )
-                else:  # +Y or others
-                    cutter = (
-                        cq.Workplane("XZ")
-                        .polyline([
-                            (0, diamond_height / 2),
-                            (diamond_width / 2, 0),
-                            (0, -diamond_height / 2),
-                            (-diamond_width / 2, 0),
-                        ])
-                        .close()
-                        .extrude(extrude_len, both=True)
-                        .val()
-                        .moved(cq.Location(cq.Vector(cx, cy, cz)))
-                    )
-
-                cutters.append(cutter)
-
-        return cutters
-
-    # Apply cutters returned from the helper (iterate per-cutter for clarity).
+        # Return the prototype and the centres it goes to (an empty tuple if
+        # the face gets no diamonds). The helper applies no cuts itself: the
+        # caller subtracts every face in a single boolean.
+        plane, lx_axis, wall_axis, side = _FACE_TABLE[face_selector]
+        points, proto = walls[plane]
+        if points is None:
+            return ()
+
+        # Map the face-local centres to global (x, y, z) on the wall: lx runs
+        # along X on the Y walls and along Y on the X walls, lz is Z.
+        wall_pos = side * (width / 2, depth / 2)[wall_axis]
+
+        # Skip the diamonds overlapping the slot region, on the wall opposite
+        # the slot only. The horizontal coordinate along that wall is lx (Y
+        # for an X-facing slot, X for a Y-facing slot). Coordinate tests
+        # against the slot bounds avoid false positives from full
+        # through-thickness geometric cutters intersecting opposite faces.
+        centers = _wall_centers(
+            points,
+            lx_axis,
+            wall_axis,
+            wall_pos,
+            face_selector == opposite_face,
+            slot_horiz_center,
+            horiz_clear,
+            skip_min_z,
+            skip_max_z,
+        )
+
+        if not len(centers):
+            return ()
+
+        return proto, centers
+
     # Include both perpendicular walls (-Y and +Y) so both are cut.
+    lattice = []
     for side in ["-Y", "+Y", "+X", "-X"]:
-        cutters = create_lattice_for_face(model, side)
-        for c in cutters:
-            model = model.cut(c)
+        placement = create_lattice_for_face(model, side)
+        if not placement:
+            continue
+        lattice.append(placement)
+
+    return model.val(), cutter.val(), lattice
 
-    return model
 
+def _cut_tools(slot: cq.Shape, lattice) -> list:
+    """Return the tools to subtract from the shell: the slot and one compound per wall.
 
-# Build a default model at import-time for tools that expect `result` to exist
-result = make_rag_basket()
+    The slot and the per-face compounds are separate tools rather than one
+    compound of everything: the slot crosses diamonds on the slot wall and
+    diamonds reaching the side edges of adjacent walls meet at the corners.
+    OCCT returns an empty or wrong result for a compound with such overlaps.
+    Diamonds on one face never overlap, so each face is a valid compound.
+    """
+    # The copies are located TopoDS shapes added straight to the compound: one
+    # gp_Trsf is updated per centre and TopLoc_Location keeps its own copy.
+    cut_tools = [slot]
+    builder = BRep_Builder()
+    trsf = gp_Trsf()
+    for proto, centers in lattice:
+        compound = TopoDS_Compound()
+        builder.MakeCompound(compound)
+        for cx, cy, cz in centers.tolist():
+            trsf.SetTranslation(gp_Vec(cx, cy, cz))
+            builder.Add(compound, proto.wrapped.Moved(TopLoc_Location(trsf)))
+        cut_tools.append(cq.Compound(compound))
+    return cut_tools
 
 
-def export_stl(cq_obj: cq.Workplane, out_dir: str, filename: str) -> str:
+def make_rag_basket(
+    width: float = DEFAULT_WIDTH,
+    depth: float = DEFAULT_DEPTH,
+    height: float = DEFAULT_HEIGHT,
+    wall_thickness: float = DEFAULT_WALL,
+    slot_width: float = DEFAULT_SLOT_WIDTH,
+    slot_depth_ratio: float = DEFAULT_SLOT_DEPTH_RATIO,
+    lattice_offset_edge: float = LATTICE_OFFSET_EDGE,
+    diamond_width: float = DIAMOND_WIDTH,
+    diamond_height: float = DIAMOND_HEIGHT,
+    diamond_spacing_x: float = DIAMOND_SPACING_X,
+    diamond_spacing_y: float = DIAMOND_SPACING_Y,
+) -> cq.Workplane:
+    """Build the rag basket cadquery object and return it.
+
+    The bottom remains solid, the top is open, the front (+Y) has a slot
+    that goes halfway down by default, and the back/left/right faces have
+    a diamond lattice.
+    """
+    shell, slot, lattice = _basket_shell_and_cutters(
+        width,
+        depth,
+        height,
+        wall_thickness,
+        slot_width,
+        slot_depth_ratio,
+        lattice_offset_edge,
+        diamond_width,
+        diamond_height,
+        diamond_spacing_x,
+        diamond_spacing_y,
+    )
+
+    # Cut the slot and the lattice of all walls in a single boolean, without
+    # the per-op clean; the model is cleaned once at the end.
+    model = cq.Workplane("XY").newObject([shell])
+    model = model.cut(cq.Workplane("XY").newObject(_cut_tools(slot, lattice)), clean=False)
+
+    return model.clean()
+
+
+def make_rag_basket_mesh(
+    tolerance: float = STL_TOLERANCE,
+    angular_tolerance: float = STL_ANGULAR_TOLERANCE,
+    **params,
+):
+    """Build the rag basket on triangle meshes; return a trimesh.Trimesh.
+
+    The shell and the same cut tools as `make_rag_basket` are tessellated and
+    subtracted by case_common.mesh_difference instead of an OCCT boolean.
+    `params` are the `make_rag_basket` keyword arguments. Requires trimesh,
+    manifold3d and case_common.py next to this script.
+    """
+    import case_common
+
+    shell, slot, lattice = _basket_shell_and_cutters(**params)
+    return case_common.mesh_difference(shell, _cut_tools(slot, lattice), tolerance, angular_tolerance)
+
+
+# Default model for tools that expect `result` to exist. It is built on first
+# access rather than at import time, so importing `make_rag_basket` is cheap.
+@functools.lru_cache(maxsize=None)
+def _default_result() -> cq.Workplane:
+    """Return the default basket, reusing a binary BRep from `.cache/` next to this script.
+
+    The cache key covers the default parameters and the source of this file,
+    so editing either triggers a rebuild; case_common.load_or_build_brep
+    writes the file atomically and rebuilds an unreadable one. The basket is
+    simply built when the cache cannot be used: CQGI runs the source without
+    `__file__`, and the script may be copied without its case_common.py
+    sibling.
+    """
+    script = globals().get("__file__")
+    if script is None:
+        return make_rag_basket()
+    try:
+        import case_common
+    except ImportError:
+        return make_rag_basket()
+
+    script = Path(script)
+    params = (
+        DEFAULT_WIDTH, DEFAULT_DEPTH, DEFAULT_HEIGHT, DEFAULT_WALL,
+        DEFAULT_SLOT_WIDTH, DEFAULT_SLOT_DEPTH_RATIO, LATTICE_OFFSET_EDGE,
+        DIAMOND_WIDTH, DIAMOND_HEIGHT, DIAMOND_SPACING_X, DIAMOND_SPACING_Y,
+    )
+    key = hashlib.blake2b(repr(params).encode() + script.read_bytes(), digest_size=16).hexdigest()
+    cache = script.parent / ".cache" / f"{key}.brep"
+    shape = case_common.load_or_build_brep(cache, lambda: make_rag_basket().val(), stale_glob="*.brep")
+    return cq.Workplane("XY").newObject([shape])
+
+
+def __getattr__(name: str):
+    """Build `rag_basket.result` lazily on first attribute access (PEP 562)."""
+    if name == "result":
+        return _default_result()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def export_stl(
+    cq_obj: cq.Workplane,
+    out_dir: str,
+    filename: str,
+    tolerance: float = STL_TOLERANCE,
+    angularTolerance: float = STL_ANGULAR_TOLERANCE,
+) -> str:
+    """Write `cq_obj` as a binary STL; the tolerances are the absolute linear (mm) and angular (rad) deflection."""
     os.makedirs(out_dir, exist_ok=True)
     path = os.path.join(out_dir, filename)
-    cq.exporters.export(cq_obj, path)
+    # Mesh once (in parallel) and write the STL straight from the shape,
+    # skipping the format-dispatch layer of cq.exporters.export
+    cq_obj.val().exportStl(
+        path,
+        tolerance=tolerance,
+        angularTolerance=angularTolerance,
+        ascii=False,
+        relative=False,
+        parallel=True,
+    )
     return path
 
 
+# CLI options that map onto make_rag_basket() keyword arguments
+GEOMETRY_ARGS = ("width", "depth", "height", "wall_thickness", "slot_width", "slot_depth_ratio")
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Generate rag-basket STL")
     # If not specified, resolve to a directory next to this script (prevents using process CWD)
     p.add_argument("--out-dir", default=None, help="Output directory (relative to script if unspecified)")
     p.add_argument("--filename", default="rag_basket.stl", help="Output filename")
     p.add_argument("--final", action="store_true", help="Place output into stl-final instead of stl-draft")
+    p.add_argument(
+        "--backend",
+        choices=("cadquery", "manifold"),
+        default="cadquery",
+        help="Boolean backend: OCCT via cadquery, or triangle meshes via trimesh + manifold3d (STL only)",
+    )
+    # Geometry overrides; anything left unset keeps the module default
+    p.add_argument("--width", type=float, default=None, help=f"Width along X (default {DEFAULT_WIDTH})")
+    p.add_argument("--depth", type=float, default=None, help=f"Depth along Y (default {DEFAULT_DEPTH})")
+    p.add_argument("--height", type=float, default=None, help=f"Height (default {DEFAULT_HEIGHT})")
+    p.add_argument("--wall-thickness", type=float, default=None, help=f"Wall thickness (default {DEFAULT_WALL})")
+    p.add_argument("--slot-width", type=float, default=None, help=f"Slot width (default {DEFAULT_SLOT_WIDTH})")
+    p.add_argument(
+        "--slot-depth-ratio",
+        type=float,
+        default=None,
+        help=f"Slot depth as a fraction of the height (default {DEFAULT_SLOT_DEPTH_RATIO})",
+    )
     return p.parse_args()
 
 
@@ -294,7 +458,15 @@ if __name__ == "__main__":
         else:
             out_dir = script_dir / "stl-draft"
 
-    out_path = export_stl(result, str(out_dir), args.filename)
+    overrides = {k: getattr(args, k) for k in GEOMETRY_ARGS if getattr(args, k) is not None}
+    if args.backend == "manifold":
+        os.makedirs(out_dir, exist_ok=True)
+        out_path = os.path.join(out_dir, args.filename)
+        make_rag_basket_mesh(**overrides).export(out_path)
+    else:
+        # Only build the default basket when no geometry was overridden
+        model = make_rag_basket(**overrides) if overrides else _default_result()
+        out_path = export_stl(model, str(out_dir), args.filename)
     print(f"Generated {out_path}")
     print("Tip: move validated prints into `stl-final/` to track them in Git.")
 
@@ -310,6 +482,11 @@ except Exception:
 # Required for processing (some tools inspect files for this line)
 # Use `.val()` to expose the underlying TopoDS shape to CQGI/ cq-cli
 # Expose the TopoDS shape directly for cq-cli / CQGI
-show_object(result.val())
+# A plain `import rag_basket` has a module spec named after the module; CQGI
+# and CQ-editor run the source without one. The CLI has already exported its
+# model above and skips the display path.
+_spec = globals().get("__spec__")
+if __name__ != "__main__" and (_spec is None or _spec.name != __name__):
+    show_object(_default_result().val())
 
 